@@ -0,0 +1,68 @@
+"""
+Before/after benchmark for the pooled frame buffers.
+
+Runs the camera-loop hot path (flip → process_frame → JPEG encode → hand-off) on
+synthetic frames at 720p and 4K, once with fresh allocations per frame (the old
+behaviour) and once with FramePool buffers, and reports ms/frame and the peak
+bytes allocated per frame (tracemalloc; numpy and OpenCV outputs are traced).
+
+    uv run python3 bench_frame_pool.py [--frames 200]
+"""
+import argparse
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+
+from bird_tracker import BirdTracker
+from frame_pool import FramePool
+from synthetic_sky import RESOLUTIONS, SkyScene
+
+_BENCH_RESOLUTIONS = ['720p', '4K']
+_CLIP_LEN = 32  # distinct frames pre-rendered per resolution; the run cycles through them
+
+
+def _run(frames: list, count: int, reuse_buffers: bool, quality: int = 85) -> dict:
+    tracker = BirdTracker(warmup_frames=10, reuse_buffers=reuse_buffers)
+    pool = FramePool(enabled=reuse_buffers)
+    params = [int(cv2.IMWRITE_JPEG_QUALITY), quality]
+
+    def step(frame: np.ndarray):
+        frame = cv2.flip(frame, 1, dst=pool.like('flipped', frame))
+        _, annotated = tracker.process_frame(frame)
+        _, jpeg = cv2.imencode('.jpg', annotated, params)
+        return memoryview(jpeg.reshape(-1)).toreadonly() if reuse_buffers else jpeg.tobytes()
+
+    step(frames[0])  # first frame allocates the pool; not representative of steady state
+
+    tracemalloc.start()
+    peaks = []
+    t0 = time.perf_counter()
+    for i in range(1, count + 1):
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        step(frames[i % len(frames)])
+        peaks.append(tracemalloc.get_traced_memory()[1] - base)
+    elapsed = time.perf_counter() - t0
+    tracemalloc.stop()
+
+    return {'ms_per_frame': elapsed / count * 1000, 'alloc_per_frame': sum(peaks) / count}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--frames', type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'res':<6} {'mode':<8} {'ms/frame':>9} {'alloc/frame':>14}")
+    for name in _BENCH_RESOLUTIONS:
+        w, h = RESOLUTIONS[name]
+        frames = [f for f, _ in SkyScene(w, h, n_birds=5).frames(_CLIP_LEN)]
+        for mode, reuse in (('before', False), ('after', True)):
+            r = _run(frames, args.frames, reuse)
+            print(f"{name:<6} {mode:<8} {r['ms_per_frame']:>9.2f} {r['alloc_per_frame'] / 1024:>11.0f} KiB")
+
+
+if __name__ == '__main__':
+    main()
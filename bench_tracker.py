@@ -0,0 +1,251 @@
+"""
+Throughput and accuracy benchmark for BirdTracker on synthetic skies.
+
+For every (resolution, flock size) case a deterministic SkyScene is rendered and
+fed through BirdTracker.process_frame with the settings from config.get_config().
+Rendering is not timed. Per case it reports:
+
+  - fps and ms/frame, plus the per-stage split from BirdTracker.stage_ms
+  - memory: peak traced allocation (numpy/OpenCV included) over a short extra pass
+  - accuracy against ground truth: MOTA, MOTP, ID switches, false positives/negatives
+
+Results are written as JSON. Pass an earlier results file with --baseline to
+print fps and MOTA changes per case.
+
+    uv run python3 bench_tracker.py --out results.json [--baseline old.json]
+    uv run python3 bench_tracker.py --resolutions 720p --flocks 1 50 --frames 100
+"""
+import argparse
+import datetime
+import json
+import logging
+import platform
+import subprocess
+import time
+import tracemalloc
+from collections import defaultdict
+from typing import Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from bird_tracker import BirdTracker
+from config import get_config
+from synthetic_sky import RESOLUTIONS, GroundTruth, SkyScene
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FLOCKS = [1, 10, 50, 200, 500]
+_MEM_FRAMES = 30  # frames traced by tracemalloc after the timed run
+_BIRD_AREA_RATIO = 0.25  # SkyScene bird area ≈ 0.25 × length² at mid wing beat
+
+
+class MotAccumulator:
+    """
+    CLEAR-MOT counts over a sequence. Each frame, ground-truth objects keep last
+    frame's hypothesis if it is still within max_dist; the rest are matched greedily
+    by distance. A ground-truth object matched to a different hypothesis than last
+    time it was matched counts as an ID switch.
+    """
+
+    def __init__(self, max_dist: float):
+        self.max_dist = max_dist
+        self.gt = self.fp = self.fn = self.id_switches = self.matches = 0
+        self._dist_sum = 0.0
+        self._last: Dict[int, int] = {}   # gt id -> hypothesis id of its latest match
+
+    def update(self, truth: GroundTruth, hyps: Dict[int, Tuple[int, int]]) -> None:
+        matched: Dict[int, int] = {}
+        used = set()
+
+        for g, h in self._last.items():
+            if g in truth and h in hyps and h not in used and _dist(truth[g], hyps[h]) <= self.max_dist:
+                matched[g] = h
+                used.add(h)
+
+        g_ids = [g for g in truth if g not in matched]
+        h_ids = [h for h in hyps if h not in used]
+        if g_ids and h_ids:
+            gt_pts = np.array([truth[g] for g in g_ids], dtype=np.float32)
+            hyp_pts = np.array([hyps[h] for h in h_ids], dtype=np.float32)
+            D = np.linalg.norm(gt_pts[:, None] - hyp_pts[None, :], axis=2)
+            free_g, free_h = set(), set()
+            for flat in np.argsort(D, axis=None):
+                r, c = divmod(int(flat), len(h_ids))
+                if D[r, c] > self.max_dist:
+                    break
+                if r in free_g or c in free_h:
+                    continue
+                free_g.add(r)
+                free_h.add(c)
+                matched[g_ids[r]] = h_ids[c]
+
+        for g, h in matched.items():
+            prev = self._last.get(g)
+            if prev is not None and prev != h:
+                self.id_switches += 1
+            self._last[g] = h
+            self._dist_sum += _dist(truth[g], hyps[h])
+
+        self.gt += len(truth)
+        self.matches += len(matched)
+        self.fp += len(hyps) - len(matched)
+        self.fn += len(truth) - len(matched)
+
+    def summary(self) -> dict:
+        return {
+            'mota':        1 - (self.fn + self.fp + self.id_switches) / self.gt if self.gt else None,
+            'motp_px':     self._dist_sum / self.matches if self.matches else None,
+            'id_switches': self.id_switches,
+            'fp':          self.fp,
+            'fn':          self.fn,
+            'gt':          self.gt,
+        }
+
+
+def _dist(a: Tuple[int, int], b: Tuple[int, int]) -> float:
+    return ((a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2) ** 0.5
+
+
+def run_case(config: dict, resolution: str, n_birds: int, frames: int, args) -> dict:
+    w, h = RESOLUTIONS[resolution]
+    scene = SkyScene(w, h, n_birds, bird_size=args.bird_size, contrast=args.contrast, seed=args.seed)
+    tracker = BirdTracker.from_config(config)
+    warmup = tracker.warmup_frames
+    max_dist = args.match_px * h / 720
+    bird_area = _BIRD_AREA_RATIO * (args.bird_size * h / 720) ** 2
+    if bird_area < config['min_area']:
+        logger.warning(
+            f"{resolution}: birds are ~{bird_area:.0f} px², below min_area={config['min_area']} — "
+            f"this case measures the area filter, not tracking (raise --bird-size)"
+        )
+
+    # Same order as camera_loop: calibrate sky brightness on the first live frame
+    tracker.calibrate_sky_brightness(scene.frame(0)[0])
+
+    mot = MotAccumulator(max_dist)
+    stage_ms: Dict[str, float] = defaultdict(float)
+    total_ms = 0.0
+    for i in range(warmup + frames):
+        frame, truth = scene.frame(i)
+        t0 = time.perf_counter()
+        results, _ = tracker.process_frame(frame)
+        dt = (time.perf_counter() - t0) * 1000
+        if results.warming_up:
+            continue
+        total_ms += dt
+        for stage, ms in tracker.stage_ms.items():
+            stage_ms[stage] += ms
+        mot.update(truth, {tid: trail[-1] for tid, trail in results.tracks.items() if trail})
+
+    tracemalloc.start()
+    for i in range(warmup + frames, warmup + frames + _MEM_FRAMES):
+        frame, _ = scene.frame(i)
+        tracemalloc.reset_peak()
+        tracker.process_frame(frame)
+    _, peak_traced = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    ms_per_frame = total_ms / frames
+    return {
+        'resolution':   resolution,
+        'width':        w,
+        'height':       h,
+        'birds':        n_birds,
+        'frames':       frames,
+        'fps':          1000 / ms_per_frame if ms_per_frame else None,
+        'ms_per_frame': ms_per_frame,
+        'stage_ms':     {k: v / frames for k, v in stage_ms.items()},
+        'peak_traced_bytes': peak_traced,
+        **mot.summary(),
+    }
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        r = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, timeout=5)
+        return r.stdout.strip() or None
+    except Exception:
+        return None
+
+
+def _fmt(value, spec: str) -> str:
+    return format(value, spec) if value is not None else '-'
+
+
+def _print_case(r: dict) -> None:
+    stages = '  '.join(f"{k} {v:.1f}" for k, v in r['stage_ms'].items())
+    print(
+        f"{r['resolution']:>6} {r['birds']:>4} birds  {_fmt(r['fps'], '7.1f')} fps  "
+        f"{r['ms_per_frame']:6.1f} ms  [{stages}]  "
+        f"MOTA {_fmt(r['mota'], '6.3f')}  IDsw {r['id_switches']:>4}  "
+        f"peak {r['peak_traced_bytes'] / 2**20:.1f} MiB",
+        flush=True,
+    )
+
+
+def _compare(cases: list, baseline_path: str) -> None:
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    old = {(c['resolution'], c['birds']): c for c in baseline.get('cases', [])}
+    print(f"\nvs {baseline_path} (rev {baseline.get('meta', {}).get('git_revision')}):")
+    for r in cases:
+        b = old.get((r['resolution'], r['birds']))
+        if b is None:
+            continue
+        fps = (r['fps'] / b['fps'] - 1) * 100 if r['fps'] and b['fps'] else None
+        mota = r['mota'] - b['mota'] if r['mota'] is not None and b['mota'] is not None else None
+        print(
+            f"{r['resolution']:>6} {r['birds']:>4} birds  fps {_fmt(fps, '+6.1f')}%  "
+            f"MOTA {_fmt(mota, '+.3f')}  IDsw {r['id_switches'] - b['id_switches']:+d}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--resolutions', nargs='+', default=list(RESOLUTIONS), choices=list(RESOLUTIONS))
+    parser.add_argument('--flocks', nargs='+', type=int, default=DEFAULT_FLOCKS)
+    parser.add_argument('--frames', type=int, default=200, help='measured frames per case, after warm-up')
+    parser.add_argument('--bird-size', type=float, default=16.0,
+                        help='bird length in px at 720p, scaled with frame height')
+    parser.add_argument('--contrast', type=float, default=0.5, help='bird darkness relative to the sky, 0-1')
+    parser.add_argument('--match-px', type=float, default=20.0, help='ground-truth match radius in px at 720p')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', default='bench_results.json')
+    parser.add_argument('--baseline', help='earlier results JSON to compare against')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    config = get_config()
+
+    cases = []
+    for resolution in args.resolutions:
+        for n_birds in args.flocks:
+            r = run_case(config, resolution, n_birds, args.frames, args)
+            _print_case(r)
+            cases.append(r)
+
+    out = {
+        'meta': {
+            'timestamp':    datetime.datetime.now().isoformat(timespec='seconds'),
+            'git_revision': _git_revision(),
+            'python':       platform.python_version(),
+            'opencv':       cv2.__version__,
+            'numpy':        np.__version__,
+            'machine':      platform.platform(),
+            'config':       config,
+            'scene':        {'bird_size': args.bird_size, 'contrast': args.contrast,
+                             'match_px': args.match_px, 'seed': args.seed},
+        },
+        'cases': cases,
+    }
+    with open(args.out, 'w') as f:
+        json.dump(out, f, indent=2)
+    print(f"\nResults → {args.out}")
+
+    if args.baseline:
+        _compare(cases, args.baseline)
+
+
+if __name__ == '__main__':
+    main()
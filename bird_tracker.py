@@ -1,9 +1,12 @@
 import cv2
 import numpy as np
 import logging
+import time
 from collections import deque, OrderedDict
 from dataclasses import dataclass
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
+
+from frame_pool import FramePool
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +23,20 @@ class BirdResults:
     warming_up: bool
 
 
+@dataclass
+class Segmentation:
+    gray: np.ndarray       # full-res grayscale frame
+    proc: np.ndarray       # gray downscaled by _PROC_SCALE
+    fg_raw: np.ndarray     # MOG2 foreground mask at proc scale
+    fg: np.ndarray         # fg_raw dilated
+    warming_up: bool
+    preprocess_ms: float
+
+
+# Moving blob at full resolution: (area px², mean brightness of its moving pixels, (x, y, w, h))
+Blob = Tuple[int, int, Tuple[int, int, int, int]]
+
+
 class BirdTracker:
     def __init__(
         self,
@@ -34,6 +51,7 @@ class BirdTracker:
         min_track_age: int = 4,
         max_brightness: int = 120,
         max_match_distance: int = 150,
+        reuse_buffers: bool = True,
     ):
         self.min_area = min_area
         self.max_area = max_area
@@ -53,6 +71,9 @@ class BirdTracker:
 
         self._kernel_dilate = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (5, 5))
 
+        # Per-stage dst buffers; process_frame allocates nothing per frame for images.
+        self._pool = FramePool(enabled=reuse_buffers)
+
         self._sky_mean: int = 0
         self._sky_darkness_pct: int = 25
 
@@ -63,6 +84,9 @@ class BirdTracker:
         self._boxes: Dict[int, Tuple[int, int, int, int]] = {}
         self._ages: Dict[int, int] = {}  # id -> total frames seen
 
+        # Wall time of each process_frame stage for the last frame, in ms.
+        self.stage_ms: Dict[str, float] = {}
+
         logger.info(
             f"BirdTracker initialized (min_area={min_area}, max_area={max_area}, "
             f"max_brightness={max_brightness}, trail={trail_length}×{trail_thickness}px, "
@@ -70,6 +94,26 @@ class BirdTracker:
             f"min_track_age={min_track_age})"
         )
 
+    @classmethod
+    def from_config(cls, config: dict, **overrides) -> 'BirdTracker':
+        """Build a tracker from config.get_config(); keyword overrides win over config values."""
+        cfg = {**config, **overrides}
+        tracker = cls(
+            bg_history=cfg['bg_history'],
+            bg_var_threshold=cfg['bg_var_threshold'],
+            min_area=cfg['min_area'],
+            max_area=cfg['max_area'],
+            max_brightness=cfg['max_brightness'],
+            max_match_distance=cfg['max_match_distance'],
+            trail_length=cfg['trail_length'],
+            trail_thickness=cfg['trail_thickness'],
+            max_disappeared=cfg['max_disappeared'],
+            warmup_frames=cfg['warmup_frames'],
+            min_track_age=cfg['min_track_age'],
+        )
+        tracker.sky_darkness_pct = cfg['sky_darkness_pct']
+        return tracker
+
     # ------------------------------------------------------------------
     # Public interface
     # ------------------------------------------------------------------
@@ -104,48 +148,103 @@ class BirdTracker:
     # 0.5 → 640×360 on a 1280×720 source: ~4× fewer pixels, ~4× faster.
     _PROC_SCALE: float = 0.5
 
-    def process_frame(self, frame: np.ndarray) -> Tuple[BirdResults, np.ndarray]:
+    def process_frame(self, frame: np.ndarray, annotate: bool = True) -> Tuple[BirdResults, Optional[np.ndarray]]:
+        """
+        Detect and track birds in a BGR or single-channel gray frame.
+        The returned annotated image is a reused buffer — it is overwritten by the
+        next call, so encode or copy it before processing another frame. With
+        annotate=False no image is drawn and None is returned in its place.
+        """
+        t0 = time.perf_counter()
+        seg = self.segment(frame)
+        t2 = time.perf_counter()
+        blobs = [] if seg.warming_up else self.find_blobs(seg, self.min_area, self.max_area)
+        t3 = time.perf_counter()
+        results = self.track_blobs(blobs, seg.warming_up)
+        t4 = time.perf_counter()
+        annotated = self._annotate(seg.gray, results.tracks, seg.warming_up) if annotate else None
+        t5 = time.perf_counter()
+        self.stage_ms = {
+            'preprocess': seg.preprocess_ms,
+            'mog2':       (t2 - t0) * 1000 - seg.preprocess_ms,
+            'detect':     (t3 - t2) * 1000,
+            'track':      (t4 - t3) * 1000,
+            'annotate':   (t5 - t4) * 1000,
+        }
+        return results, annotated
+
+    def segment(self, frame: np.ndarray) -> Segmentation:
+        """
+        Advance the frame counter and run background subtraction. The first stage of
+        process_frame; the returned images are reused buffers, valid until the next call.
+        """
         self._frame_count += 1
         warming_up = self._frame_count <= self.warmup_frames
+        t0 = time.perf_counter()
 
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        pool = self._pool
+        h, w = frame.shape[:2]
+        if frame.ndim == 2:
+            gray = frame  # e.g. a grayscale recording; used read-only
+        else:
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=pool.get('gray', (h, w)))
 
         # Downscale for MOG2 and contour detection; keep full-res gray for annotation.
         scale = self._PROC_SCALE
-        proc = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        proc_w, proc_h = max(1, int(round(w * scale))), max(1, int(round(h * scale)))
+        proc_shape = (proc_h, proc_w)
+        proc = cv2.resize(gray, (proc_w, proc_h), dst=pool.get('proc', proc_shape), interpolation=cv2.INTER_AREA)
+
+        t1 = time.perf_counter()
 
         learning_rate = 0.5 if warming_up else -1
-        fg_mask = self.bg_subtractor.apply(proc, learningRate=learning_rate)
-        fg_mask_raw = fg_mask  # pre-dilate: marks exactly the moving pixels, used for brightness sampling
-        fg_mask = cv2.dilate(fg_mask, self._kernel_dilate, iterations=1)
+        # pre-dilate: marks exactly the moving pixels, used for brightness sampling
+        fg_mask_raw = self.bg_subtractor.apply(proc, pool.get('fg_raw', proc_shape), learning_rate)
+        fg_mask = cv2.dilate(fg_mask_raw, self._kernel_dilate, dst=pool.get('fg', proc_shape), iterations=1)
 
+        return Segmentation(gray, proc, fg_mask_raw, fg_mask, warming_up, (t1 - t0) * 1000)
+
+    def find_blobs(self, seg: Segmentation, min_area: int, max_area: int) -> List[Blob]:
+        """
+        Moving blobs with full-res area in [min_area, max_area], with the mean brightness
+        of their moving pixels. Not filtered by brightness — that is up to track_blobs.
+        """
+        blobs: List[Blob] = []
+        contours, _ = cv2.findContours(seg.fg, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        inv = 1.0 / self._PROC_SCALE
+        area_inv = inv * inv  # contour areas are in proc pixels²; scale to full-res px²
+        for cnt in contours:
+            area_fr = int(cv2.contourArea(cnt) * area_inv)
+            if not (min_area <= area_fr <= max_area):
+                continue
+            px, py, pw, ph = cv2.boundingRect(cnt)
+            # Sample brightness from the actual moving pixels (pre-dilate mask, proc scale).
+            # The dilated bounding box is mostly sky padding; fg_raw isolates the bird pixels.
+            fg_crop = seg.fg_raw[py:py + ph, px:px + pw]
+            proc_crop = seg.proc[py:py + ph, px:px + pw]
+            bird_pixels = proc_crop[fg_crop > 0]
+            mean_brightness = int(np.mean(bird_pixels)) if bird_pixels.size > 0 else 128
+            # Map bounding rect back to full-res coordinates for centroid & box output
+            fx = int(round(px * inv))
+            fy = int(round(py * inv))
+            fw = int(round(pw * inv))
+            fh = int(round(ph * inv))
+            blobs.append((area_fr, mean_brightness, (fx, fy, fw, fh)))
+        return blobs
+
+    def track_blobs(self, blobs: List[Blob], warming_up: bool) -> BirdResults:
+        """
+        Apply this tracker's area and brightness limits to blobs and update the tracks.
+        Split from process_frame so one segmentation pass can feed several trackers
+        (see tune.py).
+        """
         centroids: List[Tuple[int, int]] = []
         boxes: List[Tuple[int, int, int, int]] = []
-
-        if not warming_up:
-            contours, _ = cv2.findContours(fg_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-            inv = 1.0 / scale
-            area_inv = inv * inv  # contour areas are in proc pixels²; scale to full-res px²
-            for cnt in contours:
-                area_fr = int(cv2.contourArea(cnt) * area_inv)
-                if not (self.min_area <= area_fr <= self.max_area):
-                    continue
-                px, py, pw, ph = cv2.boundingRect(cnt)
-                # Sample brightness from the actual moving pixels (pre-dilate mask, proc scale).
-                # The dilated bounding box is mostly sky padding; fg_mask_raw isolates the bird pixels.
-                fg_crop = fg_mask_raw[py:py + ph, px:px + pw]
-                proc_crop = proc[py:py + ph, px:px + pw]
-                bird_pixels = proc_crop[fg_crop > 0]
-                mean_brightness = int(np.mean(bird_pixels)) if bird_pixels.size > 0 else 128
-                # Map bounding rect back to full-res coordinates for centroid & box output
-                fx = int(round(px * inv))
-                fy = int(round(py * inv))
-                fw = int(round(pw * inv))
-                fh = int(round(ph * inv))
-                if mean_brightness > self.max_brightness:
-                    continue
-                centroids.append((fx + fw // 2, fy + fh // 2))
-                boxes.append((fx, fy, fw, fh))
+        for area, brightness, (x, y, w, h) in blobs:
+            if not (self.min_area <= area <= self.max_area) or brightness > self.max_brightness:
+                continue
+            centroids.append((x + w // 2, y + h // 2))
+            boxes.append((x, y, w, h))
 
         self._update_tracks(centroids, boxes)
 
@@ -158,15 +257,17 @@ class BirdTracker:
         confirmed_boxes = [
             self._boxes[obj_id] for obj_id in confirmed if obj_id in self._boxes
         ]
-
-        annotated = self._annotate(gray, confirmed, warming_up)
-        results = BirdResults(
+        return BirdResults(
             tracks=confirmed,
             boxes=confirmed_boxes,
             centroids=centroids,
             warming_up=warming_up,
         )
-        return results, annotated
+
+    @property
+    def tracks_started(self) -> int:
+        """Tracks registered since the last reset, confirmed or not."""
+        return self._next_id
 
     def calibrate_sky_brightness(self, frame: np.ndarray) -> int:
         """
@@ -279,7 +380,7 @@ class BirdTracker:
         confirmed: Dict[int, deque],
         warming_up: bool,
     ) -> np.ndarray:
-        display = cv2.cvtColor(gray, cv2.COLOR_GRAY2BGR)
+        display = cv2.cvtColor(gray, cv2.COLOR_GRAY2BGR, dst=self._pool.get('display', gray.shape + (3,)))
 
         if warming_up:
             pct = int(self._frame_count / self.warmup_frames * 100)
@@ -3,16 +3,21 @@ import json
 import logging
 import os
 import subprocess
+import threading
+import time
+from typing import Dict, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+_MAX_INDEX = 5
 
-def _get_camera_names() -> list:
+
+def _get_camera_names(timeout: float = 5.0) -> list:
     """Return camera display names from macOS system_profiler, in AVFoundation order."""
     try:
         r = subprocess.run(
             ['system_profiler', 'SPCameraDataType', '-json'],
-            capture_output=True, text=True, timeout=5,
+            capture_output=True, text=True, timeout=timeout,
         )
         data = json.loads(r.stdout)
         return [c['_name'] for c in data.get('SPCameraDataType', [])]
@@ -20,37 +25,171 @@ def _get_camera_names() -> list:
         return []
 
 
-def detect() -> list:
+def _probe(index: int, results: dict) -> None:
+    cap = cv2.VideoCapture(index)
+    try:
+        if cap.isOpened():
+            results[index] = (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+        else:
+            results[index] = None
+    finally:
+        cap.release()
+
+
+def _camera_entry(index: int, name: Optional[str], w: int, h: int) -> dict:
+    """name is None when the real device name is unknown."""
+    return {
+        'index': index,
+        'name': name,
+        'label': f"{name or f'Camera {index}'}  ({w}×{h})",
+        'width': w,
+        'height': h,
+    }
+
+
+def detect(timeout: float = 3.0, known: Optional[Dict[int, Tuple[int, int]]] = None) -> dict:
     """
-    Probe camera indices 0-4 and return a list of dicts:
-      {'index': int, 'label': str}
-    Uses system_profiler to get real camera names where available.
+    Probe camera indices 0-4 concurrently and return
+      {'cameras': [{'index', 'name', 'label', 'width', 'height'}], 'timed_out': [int]}
+    Each probe runs in its own daemon thread; probes still blocked after `timeout`
+    seconds are abandoned and listed in 'timed_out'. `known` maps indices that are
+    already open (e.g. the active camera) to their size; those are not probed again.
+    Uses system_profiler, run alongside the probes under the same timeout, to get
+    real camera names. Those are matched to indices by position, so if any probe or
+    the name lookup timed out the cameras are left unnamed ('Camera {i}') rather
+    than risk giving one another's name.
     """
-    found_indices = []
-    found_sizes = []
+    known = known or {}
+    sizes: Dict[int, Optional[Tuple[int, int]]] = dict(known)
+    names: list = []
+    deadline = time.monotonic() + timeout
+
+    def _names():
+        names.extend(_get_camera_names(timeout))
+
+    names_thread = threading.Thread(target=_names, daemon=True)
+    names_thread.start()
+    probes = [
+        threading.Thread(target=_probe, args=(i, sizes), daemon=True)
+        for i in range(_MAX_INDEX) if i not in known
+    ]
 
-    devnull_fd = os.open(os.devnull, os.O_WRONLY)
-    saved_stderr = os.dup(2)
-    os.dup2(devnull_fd, 2)
+    # Silence OpenCV's "camera index out of range" noise while the probes run. The
+    # log level is process-wide, so this also hides OpenCV errors from the live
+    # capture loop — keep the window to the probes only (at most `timeout` seconds).
+    saved_level = cv2.utils.logging.getLogLevel()
+    cv2.utils.logging.setLogLevel(cv2.utils.logging.LOG_LEVEL_SILENT)
     try:
-        for i in range(5):
-            cap = cv2.VideoCapture(i)
-            if cap.isOpened():
-                w = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-                h = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-                found_indices.append(i)
-                found_sizes.append((w, h))
-                cap.release()
+        for t in probes:
+            t.start()
+        for t in probes:
+            t.join(max(0.0, deadline - time.monotonic()))
     finally:
-        os.dup2(saved_stderr, 2)
-        os.close(saved_stderr)
-        os.close(devnull_fd)
+        cv2.utils.logging.setLogLevel(saved_level)
+    names_thread.join(max(0.0, deadline - time.monotonic()))
+    names_timed_out = names_thread.is_alive()
 
-    names = _get_camera_names()
+    sizes = dict(sizes)  # abandoned probes may still write to the original
+    found = sorted(i for i, size in sizes.items() if size is not None)
+    timed_out = [i for i in range(_MAX_INDEX) if i not in sizes]
+    if timed_out:
+        logger.warning(f"Camera probe timed out after {timeout:.1f}s for indices {timed_out}")
+    if names_timed_out:
+        logger.warning(f"Camera name lookup timed out after {timeout:.1f}s; cameras left unnamed")
+
+    # An abandoned lookup may still be filling the list
+    names = [] if timed_out or names_timed_out else list(names)
     cameras = []
-    for pos, (i, (w, h)) in enumerate(zip(found_indices, found_sizes)):
-        name = names[pos] if pos < len(names) else f'Camera {i}'
-        cameras.append({'index': i, 'label': f'{name}  ({w}×{h})'})
+    for pos, i in enumerate(found):
+        w, h = sizes[i]
+        name = names[pos] if pos < len(names) else None
+        cameras.append(_camera_entry(i, name, w, h))
 
     logger.info(f"Cameras detected: {[c['label'] for c in cameras]}")
-    return cameras
+    return {'cameras': cameras, 'timed_out': timed_out}
+
+
+class CameraDiscovery:
+    """
+    Camera list for the UI without delaying startup.
+
+    The last good list is loaded from a JSON cache on construction and served
+    straight away; start() re-probes in a background thread and replaces it (and
+    the cache) when done. Cached entries are only trusted until then — a camera
+    whose probe timed out keeps its cached entry, marked stale.
+    """
+
+    def __init__(self, cache_path: str, probe_timeout: float = 3.0):
+        self._lock = threading.Lock()
+        self._cache_path = cache_path
+        self._probe_timeout = probe_timeout
+        self._cameras: list = []
+        self._source = 'none'       # 'none' | 'cache' | 'probe'
+        self._scanning = False
+        self._updated: Optional[float] = None
+
+        try:
+            with open(cache_path) as f:
+                cached = json.load(f)
+            self._cameras = [dict(c, stale=True) for c in cached['cameras']]
+            self._updated = cached.get('updated')
+            self._source = 'cache'
+            logger.info(f"Cached cameras: {[c['label'] for c in self._cameras]}")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable camera cache {cache_path}: {e}")
+
+    def start(self, known: Optional[Dict[int, Tuple[int, int]]] = None) -> None:
+        with self._lock:
+            if self._scanning:
+                return
+            self._scanning = True
+        threading.Thread(target=self._run, args=(known,), daemon=True).start()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                'cameras':  [dict(c) for c in self._cameras],
+                'source':   self._source,
+                'scanning': self._scanning,
+                'updated':  self._updated,
+            }
+
+    def _run(self, known: Optional[Dict[int, Tuple[int, int]]]) -> None:
+        try:
+            result = detect(self._probe_timeout, known)
+        except Exception as e:
+            logger.warning(f"Camera discovery failed: {e}")
+            with self._lock:
+                self._scanning = False
+            return
+
+        with self._lock:
+            cached = {c['index']: c for c in self._cameras}
+            cameras = []
+            for c in result['cameras']:
+                old = cached.get(c['index'])
+                if c['name'] is None and old and old.get('name'):
+                    # Unnamed because a probe timed out: keep the name last seen at this index
+                    c = _camera_entry(c['index'], old['name'], c['width'], c['height'])
+                cameras.append(dict(c, stale=False))
+            cameras += [c for c in self._cameras if c['index'] in result['timed_out']]
+            cameras.sort(key=lambda c: c['index'])
+            self._cameras = cameras
+            self._source = 'probe'
+            self._scanning = False
+            self._updated = time.time()
+            self._save(cameras)
+
+    def _save(self, cameras: list) -> None:
+        # Timed-out cameras keep their previous entry so one slow probe doesn't drop them.
+        entries = [{k: v for k, v in c.items() if k != 'stale'} for c in cameras]
+        try:
+            os.makedirs(os.path.dirname(self._cache_path) or '.', exist_ok=True)
+            tmp = self._cache_path + '.tmp'
+            with open(tmp, 'w') as f:
+                json.dump({'cameras': entries, 'updated': self._updated}, f, indent=2)
+            os.replace(tmp, self._cache_path)
+        except OSError as e:
+            logger.warning(f"Could not write camera cache {self._cache_path}: {e}")
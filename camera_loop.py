@@ -2,8 +2,11 @@ import cv2
 import time
 import logging
 import threading
+from typing import Optional
 
 from bird_tracker import BirdTracker
+from frame_pool import FramePool
+from recording import FrameRecorder
 from state import AppState
 
 logger = logging.getLogger(__name__)
@@ -21,12 +24,14 @@ def initialize(camera_index: int) -> cv2.VideoCapture:
 
 
 def run(
-    cap: cv2.VideoCapture,
+    cap,  # cv2.VideoCapture or recording.ReplaySource
     tracker: BirdTracker,
     state: AppState,
     stop_event: threading.Event,
     display_quality: int = 85,
     recalibrate_interval: float = 15.0,
+    reuse_buffers: bool = True,
+    recorder: Optional[FrameRecorder] = None,
 ) -> None:
     frame_count = 0
     last_fps_time = time.time()
@@ -39,18 +44,30 @@ def run(
     timing_count = 0
     t_capture = t_track = t_encode = 0.0
 
+    # cap.read fills the previous frame in place when the size matches; the flip and
+    # paused-display stages write into pooled buffers (see FramePool).
+    pool = FramePool(enabled=reuse_buffers)
+    capture_buf = None
+
     while not stop_event.is_set():
         t0 = time.perf_counter()
-        ret, frame = cap.read()
+        ret, frame = cap.read(capture_buf)
         t1 = time.perf_counter()
         if not ret:
             time.sleep(0.01)
             continue
+        if pool.enabled:
+            capture_buf = frame
 
         now = time.time()
         params = state.get_tracker_params()
+        if recorder is not None:
+            # As delivered by the camera (before flip or tracking), with the live settings.
+            # max_brightness is left out: replay recomputes it by calibrating.
+            recorder.write(frame, now, {k: v for k, v in params.items() if k != 'max_brightness'})
+
         if params['flip_horizontal']:
-            frame = cv2.flip(frame, 1)
+            frame = cv2.flip(frame, 1, dst=pool.like('flipped', frame))
 
         resuming_tracking = not prev_tracking and params['tracking_active']
         if prev_tracking and not params['tracking_active']:
@@ -73,8 +90,11 @@ def run(
             active = len(results.tracks)
             warming_up = results.warming_up
         else:
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-            annotated = cv2.cvtColor(gray, cv2.COLOR_GRAY2BGR)
+            if frame.ndim == 2:
+                gray = frame
+            else:
+                gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=pool.get('gray', frame.shape[:2]))
+            annotated = cv2.cvtColor(gray, cv2.COLOR_GRAY2BGR, dst=pool.get('display', gray.shape + (3,)))
             active = 0
             warming_up = False
 
@@ -104,6 +124,8 @@ def run(
             timing_count = 0
             t_capture = t_track = t_encode = 0.0
 
-        state.push_frame(jpeg.tobytes(), active, current_fps, warming_up)
+        # imencode returns a fresh array each call, so a read-only view of it is safe to
+        # share with Flask without the tobytes() copy.
+        state.push_frame(memoryview(jpeg.reshape(-1)).toreadonly(), active, current_fps, warming_up)
 
     logger.info("Camera loop stopped.")
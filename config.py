@@ -7,6 +7,8 @@ load_dotenv()
 def get_config() -> dict:
     return {
         'camera_index':     int(os.getenv('CAMERA_INDEX', 1)),
+        'camera_cache':     os.getenv('CAMERA_CACHE', os.path.join(os.path.expanduser('~'), '.cache', 'bird_tracker', 'cameras.json')),
+        'camera_probe_timeout': float(os.getenv('CAMERA_PROBE_TIMEOUT', 3.0)),
         'web_port':         int(os.getenv('WEB_PORT', 5001)),
         'bind_host':        os.getenv('BIND_HOST', '127.0.0.1'),
         'bg_history':       int(os.getenv('BG_HISTORY', 500)),
@@ -24,4 +26,8 @@ def get_config() -> dict:
         'recalibrate_interval':  float(os.getenv('RECALIBRATE_INTERVAL', 15.0)),
         'sky_darkness_pct':      int(os.getenv('SKY_DARKNESS_PCT', 25)),
         'max_match_distance':    int(os.getenv('MAX_MATCH_DISTANCE', 150)),
+        'record_dir':            os.getenv('RECORD_DIR', ''),
+        'record_grayscale':      os.getenv('RECORD_GRAYSCALE', 'false').lower() == 'true',
+        'replay_path':           os.getenv('REPLAY_PATH', ''),
+        'replay_realtime':       os.getenv('REPLAY_REALTIME', 'true').lower() == 'true',
     }
@@ -0,0 +1,39 @@
+import logging
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class FramePool:
+    """
+    Named, reusable output buffers for the per-frame OpenCV calls.
+
+    Each hot-path stage asks for its `dst` buffer by name and shape. The buffer is
+    allocated once and handed back on every later frame; it is only replaced when
+    the resolution (or dtype) changes. With enabled=False every lookup returns None,
+    which makes OpenCV allocate a fresh output array — the pre-pool behaviour, kept
+    for benchmarking.
+
+    Buffers are overwritten on the next frame: anything returned from the hot path
+    must be consumed (encoded, copied) before the next frame is processed.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._buffers: Dict[str, np.ndarray] = {}
+
+    def get(self, name: str, shape: Tuple[int, ...], dtype=np.uint8) -> Optional[np.ndarray]:
+        if not self.enabled:
+            return None
+        buf = self._buffers.get(name)
+        if buf is None or buf.shape != shape or buf.dtype != dtype:
+            buf = np.empty(shape, dtype=dtype)
+            self._buffers[name] = buf
+            logger.debug(f"FramePool: allocated '{name}' {shape} {np.dtype(dtype).name}")
+        return buf
+
+    def like(self, name: str, src: np.ndarray) -> Optional[np.ndarray]:
+        """Buffer with the same shape and dtype as src."""
+        return self.get(name, src.shape, src.dtype)
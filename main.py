@@ -1,11 +1,17 @@
+import datetime
 import logging
+import os
 import threading
 import time
 import webbrowser
 
+import cv2
+
 from config import get_config
 from state import AppState
 from bird_tracker import BirdTracker
+from recording import FrameRecorder, ReplaySource
+from camera_detect import CameraDiscovery
 import camera_loop
 import web_app
 
@@ -21,33 +27,47 @@ def main() -> None:
 
     camera_index = config['camera_index']
 
-    tracker = BirdTracker(
-        bg_history=config['bg_history'],
-        bg_var_threshold=config['bg_var_threshold'],
-        min_area=config['min_area'],
-        max_area=config['max_area'],
-        max_brightness=config['max_brightness'],
-        max_match_distance=config['max_match_distance'],
-        trail_length=config['trail_length'],
-        trail_thickness=config['trail_thickness'],
-        max_disappeared=config['max_disappeared'],
-        warmup_frames=config['warmup_frames'],
-        min_track_age=config['min_track_age'],
-    )
+    tracker = BirdTracker.from_config(config)
+
+    # Serves the cached camera list right away; the full probe runs once the
+    # configured camera is open so it never delays startup.
+    discovery = CameraDiscovery(config['camera_cache'], config['camera_probe_timeout'])
 
     try:
-        cap = camera_loop.initialize(camera_index)
-    except RuntimeError as e:
+        if config['replay_path']:
+            cap = ReplaySource(config['replay_path'], realtime=config['replay_realtime'], loop=True)
+        else:
+            cap = camera_loop.initialize(camera_index)
+    except (RuntimeError, OSError) as e:
         logger.error(e)
+        cached = [c['label'] for c in discovery.snapshot()['cameras']]
+        if cached and not config['replay_path']:
+            logger.error(f"Last known cameras: {cached} — set CAMERA_INDEX in .env")
         return
 
+    if config['replay_path']:
+        discovery.start()
+    else:
+        size = (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+        discovery.start(known={camera_index: size})
+
+    recorder = None
+    if config['record_dir']:
+        stamp = datetime.datetime.now().strftime('%Y%m%d-%H%M%S')
+        recorder = FrameRecorder(
+            os.path.join(config['record_dir'], stamp),
+            grayscale=config['record_grayscale'],
+            metadata={'config': config},
+        )
+
     state = AppState(config)
-    web_app.init(state)
+    web_app.init(state, discovery)
 
     stop_event = threading.Event()
     cam_thread = threading.Thread(
         target=camera_loop.run,
         args=(cap, tracker, state, stop_event, config['display_quality'], config['recalibrate_interval']),
+        kwargs={'recorder': recorder},
         daemon=True,
     )
     cam_thread.start()
@@ -73,6 +93,10 @@ def main() -> None:
         stop_event.set()
         cam_thread.join(timeout=2.0)
         cap.release()
+        if recorder is not None:
+            # Safe even if the join timed out: close() waits for an in-flight write()
+            # and later writes are ignored.
+            recorder.close()
         logger.info("Done.")
 
 
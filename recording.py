@@ -0,0 +1,365 @@
+import errno
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from bisect import bisect_right
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Iterator, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# On-disk layout of a recording directory:
+#   meta.json            frame shape, chunk list, tracker param changes by frame index,
+#                        recorder metadata (e.g. config snapshot at start)
+#   chunk_00000.frames   raw uint8 frames, (n, h, w[, 3]) C-order, no header
+#   chunk_00000.ts       float64 capture timestamps (time.time()), one per frame
+# Chunks are plain arrays so replay can np.memmap them and hand out views without copying.
+_FORMAT_VERSION = 1
+_META = 'meta.json'
+_MIN_FREE_BYTES = 64 * 2**20  # left free on the disk after each new chunk
+
+
+def _chunk_paths(path: str, index: int) -> Tuple[str, str]:
+    base = os.path.join(path, f'chunk_{index:05d}')
+    return base + '.frames', base + '.ts'
+
+
+class FrameRecorder:
+    """
+    Dump camera frames and their timestamps into a chunked, memory-mapped recording.
+
+    Each chunk is preallocated as a memmap of ~chunk_bytes and frames are written
+    straight into it. Opening the next chunk, and truncating a full one to the frames
+    actually written and rewriting meta.json, happen on a single writer thread, so
+    write() on the capture thread only copies the frame. A crash loses at most the
+    open chunk. grayscale=True stores the BGR→gray conversion BirdTracker makes
+    anyway — a third of the bytes, and identical input to the tracker.
+
+    Pass the live tracker params to write() and every change is stored with the
+    frame index it applies from (see ReplaySource.params_at).
+
+    Recording never takes the caller down: a chunk is only opened if it fits on the
+    disk, and any error (disk full, too many open files, permissions) is logged once
+    and ends the recording cleanly — frames written so far stay replayable, later
+    write() calls do nothing.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        grayscale: bool = False,
+        chunk_bytes: int = 256 * 2**20,
+        metadata: Optional[dict] = None,
+    ):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.grayscale = grayscale
+        self._chunk_bytes = chunk_bytes
+        self._metadata = metadata or {}
+
+        # write() and close() may be called from different threads (camera loop / main)
+        self._lock = threading.Lock()
+        self._closed = False
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='recorder')
+
+        self._shape: Optional[Tuple[int, ...]] = None
+        self._chunks: List[dict] = []       # written on the writer thread only
+        self._index = 0                     # chunk currently being filled
+        self._frames: Optional[np.memmap] = None
+        self._ts: Optional[np.memmap] = None
+        self._next: Optional[Future] = None  # the following chunk, opened ahead of time
+        self._next_index = 0
+        self._n = 0            # frames written to the open chunk
+        self._total = 0
+        self._skipped = 0
+        self._params: Optional[dict] = None
+        self._param_events: List[dict] = []
+        logger.info(f"Recording frames to {path} ({'gray' if grayscale else 'BGR'})")
+
+    def write(self, frame: np.ndarray, timestamp: float, params: Optional[dict] = None) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            try:
+                self._write(frame, timestamp, params)
+            except Exception as e:
+                logger.error(f"Recording {self.path} stopped after {self._total} frames: {e}")
+                self._shutdown()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._shutdown()
+        logger.info(f"Recording closed: {self._total} frames in {len(self._chunks)} chunks → {self.path}")
+
+    def __enter__(self) -> 'FrameRecorder':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ------------------------------------------------------------------
+
+    def _write(self, frame: np.ndarray, timestamp: float, params: Optional[dict]) -> None:
+        shape = frame.shape[:2] if self.grayscale else frame.shape
+        if self._shape is None:
+            self._shape = shape
+        elif shape != self._shape:
+            if self._skipped == 0:
+                logger.warning(f"Frame size changed {self._shape} → {shape}; not recording those frames")
+            self._skipped += 1
+            return
+
+        if self._frames is None:
+            self._frames, self._ts = self._open_chunk(self._index)
+            self._prefetch()
+        if params is not None and params != self._params:
+            self._params = dict(params)
+            self._param_events.append({'frame': self._total, 'params': self._params})
+
+        if self.grayscale and frame.ndim == 3:
+            cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=self._frames[self._n])
+        else:
+            self._frames[self._n] = frame
+        self._ts[self._n] = timestamp
+        self._n += 1
+        self._total += 1
+        if self._n == len(self._frames):
+            self._rollover()
+
+    def _shutdown(self) -> None:
+        """With the lock held: close the open chunk, drop the prefetched one, write meta.json."""
+        self._closed = True
+        if self._frames is not None:
+            self._submit_close()
+        if self._next is not None:
+            self._submit(self._discard_chunk, self._next_index)
+            self._next = None
+        self._writer.shutdown(wait=True)
+        try:
+            self._write_meta(self._param_events)
+        except OSError as e:
+            logger.error(f"Recording {self.path}: could not write {_META}: {e}")
+
+    def _prefetch(self) -> None:
+        self._next_index = self._index + 1
+        self._next = self._writer.submit(self._open_chunk, self._next_index)
+
+    def _rollover(self) -> None:
+        self._submit_close()
+        self._index += 1
+        self._n = 0
+        self._frames, self._ts = self._next.result()  # opened a whole chunk ago; normally ready
+        self._prefetch()
+
+    def _submit_close(self) -> None:
+        # Hand the maps over in a list the writer empties, so they are unmapped there
+        self._submit(self._close_chunk, self._index, self._n, [(self._frames, self._ts)],
+                     list(self._param_events))
+        self._frames = self._ts = None
+
+    def _submit(self, fn, *args) -> None:
+        def _log_failure(future: Future) -> None:
+            if future.exception() is not None:
+                logger.error(f"Recording {self.path}: {fn.__name__} failed: {future.exception()}")
+        self._writer.submit(fn, *args).add_done_callback(_log_failure)
+
+    def _open_chunk(self, index: int) -> Tuple[np.memmap, np.memmap]:
+        frames_path, ts_path = _chunk_paths(self.path, index)
+        frame_bytes = int(np.prod(self._shape))
+        capacity = max(1, self._chunk_bytes // frame_bytes)
+        need = capacity * (frame_bytes + 8)
+        free = shutil.disk_usage(self.path).free
+        if free < need + _MIN_FREE_BYTES:
+            raise OSError(errno.ENOSPC, f"{free / 2**20:.0f} MiB free, next chunk needs {need / 2**20:.0f} MiB",
+                          self.path)
+        frames = _allocate(frames_path, np.uint8, (capacity, *self._shape))
+        ts = _allocate(ts_path, np.float64, (capacity,))
+        return frames, ts
+
+    def _discard_chunk(self, index: int) -> None:
+        """Writer thread: remove a prefetched chunk that never got a frame."""
+        for p in _chunk_paths(self.path, index):
+            try:
+                os.remove(p)
+            except FileNotFoundError:
+                pass
+
+    def _close_chunk(self, index: int, n: int, maps: list, param_events: Optional[list] = None) -> None:
+        """Writer thread: truncate chunk `index` to n frames and record it in meta.json."""
+        frames_path, ts_path = _chunk_paths(self.path, index)
+        maps.clear()  # the page cache is coherent, so no flush is needed before truncating
+        frame_bytes = int(np.prod(self._shape))
+        os.truncate(frames_path, n * frame_bytes)
+        os.truncate(ts_path, n * 8)
+        if n:
+            self._chunks.append({
+                'frames': os.path.basename(frames_path),
+                'timestamps': os.path.basename(ts_path),
+                'count': n,
+            })
+        else:
+            os.remove(frames_path)
+            os.remove(ts_path)
+        if param_events is not None:
+            self._write_meta(param_events)
+
+    def _write_meta(self, param_events: list) -> None:
+        meta = {
+            'version':   _FORMAT_VERSION,
+            'shape':     list(self._shape) if self._shape else None,
+            'dtype':     'uint8',
+            'grayscale': self.grayscale,
+            'chunks':    self._chunks,
+            'params':    param_events,
+            **self._metadata,
+        }
+        tmp = os.path.join(self.path, _META + '.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(meta, f, indent=2)
+        os.replace(tmp, os.path.join(self.path, _META))
+
+
+def _allocate(path: str, dtype, shape: Tuple[int, ...]) -> np.memmap:
+    """
+    Map a new file of the given shape. Its blocks are reserved up front where the OS
+    supports it: a sparse file on a disk that fills up turns a later page write into
+    SIGBUS, which kills the process instead of raising here.
+    """
+    nbytes = int(np.prod(shape)) * np.dtype(dtype).itemsize
+    with open(path, 'wb') as f:
+        if hasattr(os, 'posix_fallocate'):
+            os.posix_fallocate(f.fileno(), 0, nbytes)
+        else:
+            f.truncate(nbytes)
+    return np.memmap(path, dtype=dtype, mode='r+', shape=shape)
+
+
+class ReplaySource:
+    """
+    Frame source over a FrameRecorder directory, with the subset of the
+    cv2.VideoCapture interface camera_loop uses (isOpened/read/get/set/release),
+    so it can stand in for the camera.
+
+    Frames are read-only views into the memory-mapped chunks — nothing is copied.
+    realtime=True paces read() to the recorded timestamps; otherwise frames are
+    returned as fast as they are asked for. loop=True restarts at the end instead
+    of returning (False, None). Like camera_loop.initialize for a camera, raises
+    RuntimeError for a recording that can't be replayed (no frames, truncated chunk).
+    """
+
+    def __init__(self, path: str, realtime: bool = True, loop: bool = False):
+        with open(os.path.join(path, _META)) as f:
+            self.meta = json.load(f)
+        if self.meta.get('version') != _FORMAT_VERSION:
+            raise RuntimeError(f"Unsupported recording version {self.meta.get('version')} in {path}")
+        self.path = path
+        self.realtime = realtime
+        self.loop = loop
+
+        shape = tuple(self.meta['shape'] or ())
+        self._frames: List[np.memmap] = []
+        self._ts: List[np.memmap] = []
+        for chunk in self.meta['chunks']:
+            n = chunk['count']
+            try:
+                self._frames.append(np.memmap(os.path.join(path, chunk['frames']), dtype=np.uint8,
+                                              mode='r', shape=(n, *shape)))
+                self._ts.append(np.memmap(os.path.join(path, chunk['timestamps']), dtype=np.float64,
+                                          mode='r', shape=(n,)))
+            except ValueError as e:  # file shorter than meta.json says
+                raise RuntimeError(f"Truncated recording {path}: {chunk['frames']}: {e}") from e
+        self._offsets = np.cumsum([0] + [len(ts) for ts in self._ts])
+        self._param_events = self.meta.get('params', [])
+        self._param_frames = [e['frame'] for e in self._param_events]
+        self.frame_count = int(self._offsets[-1])
+        if not self.frame_count:
+            raise RuntimeError(f"Recording {path} has no frames")
+        self.height, self.width = (shape[0], shape[1]) if shape else (0, 0)
+
+        self._pos = 0
+        self._last_ts = 0.0
+        self._start_wall: Optional[float] = None
+        self._start_ts = 0.0
+        logger.info(f"Replaying {path}: {self.frame_count} frames {self.width}×{self.height} "
+                    f"({'realtime' if realtime else 'flat-out'})")
+
+    def frame(self, i: int) -> Tuple[np.ndarray, float]:
+        """Frame i and its capture timestamp (zero-copy view)."""
+        c = int(np.searchsorted(self._offsets, i, side='right')) - 1
+        j = i - int(self._offsets[c])
+        return self._frames[c][j], float(self._ts[c][j])
+
+    def params_at(self, i: int) -> Optional[dict]:
+        """Tracker params (AppState.get_tracker_params) in effect at frame i, if recorded."""
+        k = bisect_right(self._param_frames, i) - 1
+        return self._param_events[k]['params'] if k >= 0 else None
+
+    def frames(self) -> Iterator[Tuple[np.ndarray, float]]:
+        for frames, ts in zip(self._frames, self._ts):
+            for j in range(len(ts)):
+                yield frames[j], float(ts[j])
+
+    # ------------------------------------------------------------------
+    # cv2.VideoCapture-compatible interface
+    # ------------------------------------------------------------------
+
+    def isOpened(self) -> bool:
+        return self.frame_count > 0
+
+    def read(self, image=None) -> Tuple[bool, Optional[np.ndarray]]:
+        # image is accepted for call compatibility with cv2.VideoCapture.read; the
+        # returned frame is always a view into the recording.
+        if self._pos >= self.frame_count:
+            if not self.loop or not self.frame_count:
+                return False, None
+            self._pos = 0
+            self._start_wall = None
+
+        frame, ts = self.frame(self._pos)
+        if self.realtime:
+            if self._start_wall is None:
+                self._start_wall, self._start_ts = time.monotonic(), ts
+            delay = (ts - self._start_ts) - (time.monotonic() - self._start_wall)
+            if delay > 0:
+                time.sleep(delay)
+        self._pos += 1
+        self._last_ts = ts
+        return True, frame
+
+    def get(self, prop: int) -> float:
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(self.width)
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(self.height)
+        if prop == cv2.CAP_PROP_FRAME_COUNT:
+            return float(self.frame_count)
+        if prop == cv2.CAP_PROP_POS_FRAMES:
+            return float(self._pos)
+        if prop == cv2.CAP_PROP_POS_MSEC:
+            return self._last_ts * 1000  # capture wall time of the last frame read, not stream offset
+        if prop == cv2.CAP_PROP_FPS:
+            if self.frame_count < 2:
+                return 0.0
+            first, last = self.frame(0)[1], self.frame(self.frame_count - 1)[1]
+            return (self.frame_count - 1) / (last - first) if last > first else 0.0
+        return 0.0
+
+    def set(self, prop: int, value: float) -> bool:
+        if prop == cv2.CAP_PROP_POS_FRAMES and 0 <= value <= self.frame_count:
+            self._pos = int(value)
+            self._start_wall = None
+            return True
+        return False
+
+    def release(self) -> None:
+        self._frames.clear()
+        self._ts.clear()
+        self.frame_count = 0
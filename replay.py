@@ -0,0 +1,129 @@
+"""
+Replay a FrameRecorder recording through BirdTracker, without camera or web UI.
+
+Uses the tracker config stored in the recording (override with --current-config to
+use .env/defaults instead), and applies the live settings recorded with the frames —
+slider changes, flip, tracking pause/resume — from the frame they changed at. Sky
+recalibration is driven by the recorded timestamps, so every run over the same
+recording produces the same tracks — field bugs can be reproduced and profiled on a
+developer machine.
+
+    uv run python3 replay.py recordings/20261019-153000
+    uv run python3 replay.py REC --realtime            # at the original frame timing
+    uv run python3 replay.py REC --profile             # cProfile, top 25 by cumulative time
+    uv run python3 replay.py REC --tracks tracks.jsonl # per-frame confirmed tracks for diffing
+"""
+import argparse
+import cProfile
+import json
+import logging
+import pstats
+import time
+from collections import defaultdict
+
+import cv2
+
+from bird_tracker import BirdTracker
+from config import get_config
+from recording import ReplaySource
+
+logger = logging.getLogger(__name__)
+
+
+def replay(source: ReplaySource, tracker: BirdTracker, config: dict, tracks_out=None) -> dict:
+    """Run every frame through the tracker as camera_loop would; return timing totals."""
+    recalibrate_interval = config['recalibrate_interval']
+    # Recordings made before live params were stored fall back to the config
+    initial = {
+        'tracking_active':  True,
+        'flip_horizontal':  config['flip_horizontal'],
+        'trail_length':     config['trail_length'],
+        'trail_thickness':  config['trail_thickness'],
+        'sky_darkness_pct': config['sky_darkness_pct'],
+    }
+    last_calibration = None
+    prev_tracking = True
+    stage_ms = defaultdict(float)
+    frames = paused = 0
+    t_start = time.perf_counter()
+
+    while True:
+        ret, frame = source.read()
+        if not ret:
+            break
+        i = int(source.get(cv2.CAP_PROP_POS_FRAMES)) - 1
+        ts = source.get(cv2.CAP_PROP_POS_MSEC) / 1000
+        params = source.params_at(i) or initial
+
+        resuming_tracking = not prev_tracking and params['tracking_active']
+        if prev_tracking and not params['tracking_active']:
+            tracker.reset()
+        prev_tracking = params['tracking_active']
+        if not params['tracking_active']:
+            paused += 1
+            continue
+
+        if params['flip_horizontal']:
+            frame = cv2.flip(frame, 1)
+        tracker.sky_darkness_pct = params['sky_darkness_pct']
+        tracker.trail_length = params['trail_length']
+        tracker.trail_thickness = params['trail_thickness']
+        if last_calibration is None or resuming_tracking or ts - last_calibration >= recalibrate_interval:
+            tracker.calibrate_sky_brightness(frame)
+            last_calibration = ts
+
+        results, _ = tracker.process_frame(frame)
+        frames += 1
+        for stage, ms in tracker.stage_ms.items():
+            stage_ms[stage] += ms
+        if tracks_out is not None:
+            tracks_out.write(json.dumps({
+                'frame': i,
+                'ts': ts,
+                'tracks': {tid: list(trail[-1]) for tid, trail in results.tracks.items() if trail},
+            }) + '\n')
+
+    elapsed = time.perf_counter() - t_start
+    return {'frames': frames, 'paused': paused, 'elapsed_s': elapsed, 'stage_ms': dict(stage_ms)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('recording')
+    parser.add_argument('--realtime', action='store_true', help='pace frames to the recorded timestamps')
+    parser.add_argument('--current-config', action='store_true', help='ignore the config stored in the recording')
+    parser.add_argument('--profile', action='store_true')
+    parser.add_argument('--tracks', help='write per-frame confirmed tracks as JSON lines')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    source = ReplaySource(args.recording, realtime=args.realtime)
+    config = get_config()
+    if not args.current_config:
+        config.update(source.meta.get('config', {}))
+    tracker = BirdTracker.from_config(config)
+
+    tracks_out = open(args.tracks, 'w') if args.tracks else None
+    profiler = cProfile.Profile() if args.profile else None
+    try:
+        if profiler:
+            profiler.enable()
+        stats = replay(source, tracker, config, tracks_out)
+    finally:
+        if profiler:
+            profiler.disable()
+        if tracks_out:
+            tracks_out.close()
+        source.release()
+
+    n = max(1, stats['frames'])
+    stages = '  '.join(f"{k} {v / n:.1f}" for k, v in stats['stage_ms'].items())
+    print(f"{stats['frames']} frames ({stats['paused']} paused) in {stats['elapsed_s']:.2f}s "
+          f"({stats['frames'] / stats['elapsed_s']:.1f} fps)  ms/frame: [{stages}]")
+    if profiler:
+        pstats.Stats(profiler).sort_stats('cumulative').print_stats(25)
+
+
+if __name__ == '__main__':
+    main()
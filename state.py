@@ -1,5 +1,8 @@
 import threading
-from typing import Optional
+from typing import Optional, Union
+
+# Encoded JPEG: bytes, or a read-only memoryview over the encoder's output buffer.
+JpegBuffer = Union[bytes, memoryview]
 
 
 class AppState:
@@ -12,7 +15,7 @@ class AppState:
         self._lock = threading.Lock()
 
         # Frame output (written by camera loop, read by Flask)
-        self._latest_frame: Optional[bytes] = None
+        self._latest_frame: Optional[JpegBuffer] = None
         self._active_tracks: int = 0
         self._fps: float = 0.0
         self._warming_up: bool = True
@@ -29,14 +32,14 @@ class AppState:
     # Camera loop → Flask  (camera loop writes, Flask reads)
     # ------------------------------------------------------------------
 
-    def push_frame(self, jpeg: bytes, active_tracks: int, fps: float, warming_up: bool) -> None:
+    def push_frame(self, jpeg: JpegBuffer, active_tracks: int, fps: float, warming_up: bool) -> None:
         with self._lock:
             self._latest_frame = jpeg
             self._active_tracks = active_tracks
             self._fps = fps
             self._warming_up = warming_up
 
-    def get_frame(self) -> Optional[bytes]:
+    def get_frame(self) -> Optional[JpegBuffer]:
         with self._lock:
             return self._latest_frame
 
@@ -0,0 +1,168 @@
+import math
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+import cv2
+import numpy as np
+
+# Named capture resolutions used by the benchmarks (width, height).
+RESOLUTIONS = {
+    '480p':  (854, 480),
+    '720p':  (1280, 720),
+    '1080p': (1920, 1080),
+    '4K':    (3840, 2160),
+}
+
+# gt_id -> (cx, cy) of every bird whose centre is inside the frame.
+GroundTruth = Dict[int, Tuple[int, int]]
+
+
+@dataclass
+class _Bird:
+    x0: float
+    y0: float
+    vx: float
+    vy: float
+    length: float         # body+wings extent along the flight direction, px
+    contrast: float       # 0 = invisible, 1 = black
+    flap_period: float    # frames per wing beat
+    flap_phase: float
+
+
+class SkyScene:
+    """
+    Deterministic synthetic sky for benchmarking BirdTracker.
+
+    A vertical sky gradient with soft drifting clouds and sensor noise, crossed by
+    n_birds dark flapping ellipses on straight trajectories. Birds that leave the
+    frame at the left/right edge re-enter on the other side under a new ground-truth
+    id (a new pass is a new object); vertically they bounce between the margins.
+
+    frame(i) depends only on the constructor arguments and i, so scenes can be
+    regenerated anywhere to reproduce a result. bird_size and speed are given at
+    720p and scaled with the frame height; the default size stays above the default
+    BIRD_MIN_AREA down to 480p (~11 px long there).
+    """
+
+    _NOISE_BANK = 4     # pre-rendered noise fields, cycled per frame
+    _EDGE_MARGIN = 20   # px outside the frame a bird travels before it wraps
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        n_birds: int,
+        bird_size: float = 16.0,
+        contrast: float = 0.5,
+        speed: float = 4.0,
+        clouds: int = 6,
+        noise: float = 2.0,
+        cloud_drift: float = 0.3,
+        seed: int = 0,
+    ):
+        self.width = width
+        self.height = height
+        self.n_birds = n_birds
+        self.cloud_drift = cloud_drift
+        rng = np.random.default_rng(seed)
+        k = height / 720
+
+        top, bottom = rng.uniform(150, 180), rng.uniform(200, 225)
+        self._gradient = np.linspace(top, bottom, height, dtype=np.float32)[:, None]
+        self._clouds = self._render_clouds(rng, clouds)
+
+        self._noise: List[np.ndarray] = []
+        if noise > 0:
+            for _ in range(self._NOISE_BANK):
+                n = rng.normal(0, noise, (height, width))
+                self._noise.append(np.clip(np.round(n), -127, 127).astype(np.int8))
+
+        self.birds: List[_Bird] = []
+        for _ in range(n_birds):
+            angle = rng.uniform(-0.5, 0.5) + (math.pi if rng.random() < 0.5 else 0.0)
+            v = speed * k * rng.uniform(0.6, 1.4)
+            self.birds.append(_Bird(
+                x0=rng.uniform(0, width),
+                y0=rng.uniform(0, height),
+                vx=v * math.cos(angle),
+                vy=v * math.sin(angle),
+                length=max(2.0, bird_size * k * rng.uniform(0.7, 1.3)),
+                contrast=float(np.clip(contrast * rng.uniform(0.8, 1.2), 0.0, 1.0)),
+                flap_period=rng.uniform(6, 14),
+                flap_phase=rng.uniform(0, 2 * math.pi),
+            ))
+
+    # ------------------------------------------------------------------
+    # Public interface
+    # ------------------------------------------------------------------
+
+    def frame(self, i: int) -> Tuple[np.ndarray, GroundTruth]:
+        """Render frame i as BGR uint8 together with its ground truth."""
+        w, h = self.width, self.height
+        cloud_w = self._clouds.shape[1]
+        off = int(i * self.cloud_drift) % (cloud_w - w + 1)
+
+        sky = self._gradient + self._clouds[:, off:off + w]
+        if self._noise:
+            sky = sky + self._noise[i % len(self._noise)]
+        gray = np.clip(sky, 0, 255).astype(np.uint8)
+
+        truth: GroundTruth = {}
+        for idx, (cx, cy, lap) in enumerate(self._positions(i)):
+            if not (0 <= cx < w and 0 <= cy < h):
+                continue
+            bird = self.birds[idx]
+            truth[lap * self.n_birds + idx] = (cx, cy)
+            self._draw_bird(gray, bird, cx, cy, i)
+
+        return cv2.cvtColor(gray, cv2.COLOR_GRAY2BGR), truth
+
+    def frames(self, count: int, start: int = 0):
+        for i in range(start, start + count):
+            yield self.frame(i)
+
+    # ------------------------------------------------------------------
+    # Rendering
+    # ------------------------------------------------------------------
+
+    def _positions(self, i: int) -> List[Tuple[int, int, int]]:
+        m = self._EDGE_MARGIN
+        span_x = self.width + 2 * m
+        span_y = max(1, self.height - 2 * m)
+        out = []
+        for b in self.birds:
+            x = b.x0 + b.vx * i + m
+            lap = abs(math.floor(x / span_x))
+            cx = x % span_x - m
+            # Triangle wave keeps y inside [m, height - m)
+            y = (b.y0 + b.vy * i - m) % (2 * span_y)
+            cy = m + (y if y < span_y else 2 * span_y - y)
+            out.append((int(cx), int(cy), lap))
+        return out
+
+    @staticmethod
+    def _draw_bird(gray: np.ndarray, bird: _Bird, cx: int, cy: int, i: int) -> None:
+        flap = 0.5 + 0.5 * math.sin(2 * math.pi * i / bird.flap_period + bird.flap_phase)
+        half_len = max(1, int(round(bird.length * (0.6 + 0.4 * flap) / 2)))
+        half_wid = max(1, int(round(bird.length * 0.2)))
+        angle = math.degrees(math.atan2(bird.vy, bird.vx)) + 90  # wings span across the flight path
+        bg = int(gray[cy, cx])
+        color = int(bg * (1 - bird.contrast))
+        cv2.ellipse(gray, (cx, cy), (half_len, half_wid), angle, 0, 360, color, -1, cv2.LINE_AA)
+
+    def _render_clouds(self, rng: np.random.Generator, count: int) -> np.ndarray:
+        """
+        Cloud brightness offsets, twice the frame width so they can drift. Drawn at
+        1/8 scale and blurred there, then upsampled — blurring at 4K is far too slow.
+        The drift offset wraps after width / cloud_drift frames (~4000 at 720p),
+        which shows up as one frame of sudden motion.
+        """
+        w, h = 2 * self.width, self.height
+        sw, sh = max(8, w // 8), max(8, h // 8)
+        small = np.zeros((sh, sw), dtype=np.float32)
+        for _ in range(count):
+            centre = (int(rng.uniform(0, sw)), int(rng.uniform(0, sh)))
+            axes = (int(rng.uniform(0.05, 0.2) * sw), int(rng.uniform(0.05, 0.2) * sh))
+            cv2.ellipse(small, centre, axes, rng.uniform(0, 180), 0, 360, float(rng.uniform(15, 35)), -1)
+        small = cv2.GaussianBlur(small, (0, 0), sigmaX=max(1.0, sh / 20))
+        return cv2.resize(small, (w, h), interpolation=cv2.INTER_LINEAR)
@@ -0,0 +1,312 @@
+"""
+Parallel parameter sweep over recorded footage — finds tracker settings without
+hand-tuning sliders on live video.
+
+A FrameRecorder directory (BGR or grayscale) is memory-mapped by every worker as
+is. Any other video file OpenCV can read is decoded once into a grayscale recording
+under --workdir (width × height bytes per frame — ~37 GB for 10 min of 1080p30) that
+the workers then map. Either way frames are shared through the page cache rather
+than decoded per worker.
+
+Configurations are grouped by bg_var_threshold, the only tuned setting that changes
+background subtraction. Each task runs MOG2 and contour extraction once per frame
+and feeds the blobs to one BirdTracker per configuration (BirdTracker.track_blobs),
+so the other settings cost only filtering and matching.
+
+Each configuration is scored on detection stability and cost:
+
+    stability = mean confirmed-track lifetime (frames) × confirmed/started tracks
+                / (1 + mean frame-to-frame change in confirmed count)
+    cost      = CPU ms per frame: segmentation for its bg_var_threshold (averaged
+                over every task of that group) + its own blob tracking
+    score     = stability − cost_weight × cost
+
+Cost is process CPU time (time.process_time, one OpenCV thread per worker), so it
+is not inflated by workers waiting for a core the way wall time would be. Ties go
+to the current settings, then to the earlier sampled configuration.
+
+This is a heuristic without ground truth — check the top results on the UI before
+adopting them. The best configuration is written as a .env snippet.
+
+    uv run python3 tune.py recordings/20261019-153000 --out tuned.env
+    uv run python3 tune.py clip.mp4 --configs 200 --workers 8 --json sweep.json
+"""
+import argparse
+import itertools
+import json
+import logging
+import math
+import os
+import random
+import shutil
+import tempfile
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Tuple
+
+import cv2
+import numpy as np
+
+from bird_tracker import BirdResults, BirdTracker
+from config import get_config
+from recording import FrameRecorder, ReplaySource
+
+logger = logging.getLogger(__name__)
+
+# config key -> (.env variable, candidate values)
+TUNED_PARAMS = {
+    'bg_var_threshold':   ('BG_VAR_THRESHOLD',   [2.0, 4.0, 8.0, 16.0, 32.0]),
+    'min_area':           ('BIRD_MIN_AREA',      [5, 10, 20, 40, 80]),
+    'max_area':           ('BIRD_MAX_AREA',      [2000, 10000, 50000]),
+    'sky_darkness_pct':   ('SKY_DARKNESS_PCT',   [10, 15, 20, 25, 35, 50]),
+    'max_match_distance': ('MAX_MATCH_DISTANCE', [50, 100, 150, 250]),
+    'min_track_age':      ('MIN_TRACK_AGE',      [1, 2, 4, 8]),
+}
+
+
+def sample_configs(base: dict, count: int, seed: int = 0) -> List[dict]:
+    """The current settings plus count-1 distinct random combinations of TUNED_PARAMS."""
+    keys = list(TUNED_PARAMS)
+    current = {k: base[k] for k in keys}
+    grid = [dict(zip(keys, combo)) for combo in itertools.product(*(v for _, v in TUNED_PARAMS.values()))]
+    grid = [cfg for cfg in grid if cfg != current]
+    return [current] + random.Random(seed).sample(grid, min(len(grid), max(0, count - 1)))
+
+
+def _video_frames(cap: cv2.VideoCapture) -> Iterator[Tuple[np.ndarray, float]]:
+    try:
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            yield frame, cap.get(cv2.CAP_PROP_POS_MSEC) / 1000
+    finally:
+        cap.release()
+
+
+def prepare_clip(path: str, workdir: str, max_frames: int = 0) -> str:
+    """
+    Path of a recording of the clip the workers can map: a FrameRecorder directory as
+    is, a video file decoded once into a grayscale recording under workdir.
+    """
+    if os.path.isdir(path):
+        ReplaySource(path, realtime=False)  # raises for an empty or truncated recording
+        return path
+
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise RuntimeError(f"Cannot open clip {path}")
+    count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    if max_frames:
+        count = min(count, max_frames) if count > 0 else max_frames
+    need = count * int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)) * int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    free = shutil.disk_usage(workdir).free
+    if need > free:
+        cap.release()
+        raise RuntimeError(f"Decoding {path} needs ~{need / 2**30:.1f} GiB in {workdir}, "
+                           f"{free / 2**30:.1f} GiB free — use --workdir or --max-frames")
+
+    frames = _video_frames(cap)
+    if max_frames:
+        frames = itertools.islice(frames, max_frames)
+    out = os.path.join(workdir, 'clip')
+    t0 = time.perf_counter()
+    written = 0
+    with FrameRecorder(out, grayscale=True, metadata={'source': path}) as recorder:
+        for frame, ts in frames:
+            recorder.write(frame, ts)
+            written += 1
+    if ReplaySource(out, realtime=False).frame_count < written:
+        raise RuntimeError(f"Ran out of space decoding {path} into {workdir} — use --workdir or --max-frames")
+    logger.info(f"Decoded {path} to shared grayscale recording in {time.perf_counter() - t0:.1f}s")
+    return out
+
+
+class _Stability:
+    """Per-configuration detection stability counters over the confirmed tracks."""
+
+    def __init__(self):
+        self._first: Dict[int, int] = {}
+        self._last: Dict[int, int] = {}
+        self._prev_count = None
+        self._jitter = 0
+        self._active = 0
+        self.frames = 0
+
+    def update(self, results: BirdResults, frame_idx: int) -> None:
+        for obj_id in results.tracks:
+            self._first.setdefault(obj_id, frame_idx)
+            self._last[obj_id] = frame_idx
+        n = len(results.tracks)
+        if self._prev_count is not None:
+            self._jitter += abs(n - self._prev_count)
+        self._prev_count = n
+        self._active += n
+        self.frames += 1
+
+    def summary(self, tracks_started: int) -> dict:
+        lifetimes = [self._last[i] - self._first[i] + 1 for i in self._first]
+        frames = max(1, self.frames)
+        return {
+            'tracks_started':    tracks_started,
+            'confirmed_tracks':  len(lifetimes),
+            'mean_track_frames': sum(lifetimes) / len(lifetimes) if lifetimes else 0.0,
+            'confirm_ratio':     len(lifetimes) / tracks_started if tracks_started else 0.0,
+            'count_jitter':      self._jitter / frames,
+            'mean_active':       self._active / frames,
+        }
+
+
+def _init_worker() -> None:
+    cv2.setNumThreads(1)  # parallelism comes from the process pool
+    logging.getLogger().setLevel(logging.WARNING)
+
+
+def _evaluate(clip: str, base: dict, configs: List[dict], max_frames: int) -> List[dict]:
+    """Run one segmentation pass over the clip and score every config (same bg_var_threshold)."""
+    source = ReplaySource(clip, realtime=False)
+    lead = BirdTracker.from_config(base, bg_var_threshold=configs[0]['bg_var_threshold'])
+    trackers = [BirdTracker.from_config(base, **cfg) for cfg in configs]
+    stats = [_Stability() for _ in configs]
+    min_area = min(cfg['min_area'] for cfg in configs)
+    max_area = max(cfg['max_area'] for cfg in configs)
+
+    shared_s = 0.0
+    track_s = [0.0] * len(configs)
+    last_calibration = None
+    frames = 0
+    for frame, ts in source.frames():
+        if max_frames and frames >= max_frames:
+            break
+        if last_calibration is None or ts - last_calibration >= base['recalibrate_interval']:
+            for tracker in trackers:
+                tracker.calibrate_sky_brightness(frame)
+            last_calibration = ts
+
+        # CPU time rather than wall time: other workers competing for cores don't count
+        t0 = time.process_time()
+        seg = lead.segment(frame)
+        blobs = [] if seg.warming_up else lead.find_blobs(seg, min_area, max_area)
+        shared_s += time.process_time() - t0
+
+        for k, tracker in enumerate(trackers):
+            t1 = time.process_time()
+            results = tracker.track_blobs(blobs, seg.warming_up)
+            track_s[k] += time.process_time() - t1
+            if not seg.warming_up:
+                stats[k].update(results, frames)
+        frames += 1
+
+    out = []
+    for cfg, tracker, st, ts_k in zip(configs, trackers, stats, track_s):
+        out.append({
+            'config':       cfg,
+            'frames':       frames,
+            'segment_cpu_ms': shared_s / max(1, frames) * 1000,
+            'track_cpu_ms': ts_k / max(1, frames) * 1000,
+            **st.summary(tracker.tracks_started),
+        })
+    return out
+
+
+def score(result: dict, cost_weight: float) -> float:
+    stability = result['mean_track_frames'] * result['confirm_ratio'] / (1 + result['count_jitter'])
+    return stability - cost_weight * result['cpu_ms_per_frame']
+
+
+def _add_cost(results: List[dict]) -> None:
+    """
+    Set cpu_ms_per_frame on every result. A bg_var_threshold group may be split over
+    several tasks that each time segmentation; all its configs get the group mean.
+    """
+    segment: Dict[float, List[float]] = defaultdict(list)
+    for r in results:
+        segment[r['config']['bg_var_threshold']].append(r['segment_cpu_ms'])
+    for r in results:
+        times = segment[r['config']['bg_var_threshold']]
+        r['cpu_ms_per_frame'] = sum(times) / len(times) + r['track_cpu_ms']
+
+
+def _tasks(configs: List[dict], workers: int) -> List[List[dict]]:
+    """Group by bg_var_threshold, then split groups so there are enough tasks for the pool."""
+    groups: Dict[float, List[dict]] = defaultdict(list)
+    for cfg in configs:
+        groups[cfg['bg_var_threshold']].append(cfg)
+    tasks = []
+    for group in groups.values():
+        parts = max(1, math.ceil(workers * len(group) / len(configs)))
+        size = math.ceil(len(group) / parts)
+        tasks += [group[i:i + size] for i in range(0, len(group), size)]
+    return tasks
+
+
+def env_snippet(config: dict, comment: str) -> str:
+    lines = [f"# {comment}"]
+    for key, (env_name, _) in TUNED_PARAMS.items():
+        lines.append(f"{env_name}={config[key]}")
+    return '\n'.join(lines) + '\n'
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('clip', help='FrameRecorder directory or video file')
+    parser.add_argument('--configs', type=int, default=200, help='number of configurations to try')
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--max-frames', type=int, default=0, help='only use the first N frames (0 = all)')
+    parser.add_argument('--workdir', help='where a video file is decoded to (default: system temp dir)')
+    parser.add_argument('--cost-weight', type=float, default=0.5, help='score penalty per CPU ms/frame')
+    parser.add_argument('--current-config', action='store_true', help='ignore the config stored in a recording')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', default='tuned.env', help='.env snippet with the best settings')
+    parser.add_argument('--json', help='write every configuration and its metrics here')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    logging.getLogger('bird_tracker').setLevel(logging.WARNING)
+
+    base = get_config()
+    if os.path.isdir(args.clip) and not args.current_config:
+        base.update(ReplaySource(args.clip, realtime=False).meta.get('config', {}))
+    configs = sample_configs(base, args.configs, args.seed)
+
+    t_start = time.perf_counter()
+    with tempfile.TemporaryDirectory(prefix='bird_tune_', dir=args.workdir) as workdir:
+        clip = prepare_clip(args.clip, workdir, args.max_frames)
+        tasks = _tasks(configs, args.workers)
+        logger.info(f"Sweeping {len(configs)} configs as {len(tasks)} tasks on {args.workers} workers")
+
+        results = []
+        with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker) as pool:
+            futures = [pool.submit(_evaluate, clip, base, task, args.max_frames) for task in tasks]
+            for done, future in enumerate(as_completed(futures), 1):
+                results += future.result()
+                logger.info(f"{done}/{len(tasks)} tasks done ({len(results)} configs)")
+
+    order = {tuple(cfg.items()): i for i, cfg in enumerate(configs)}  # configs[0] is the current one
+    _add_cost(results)
+    for r in results:
+        r['score'] = score(r, args.cost_weight)
+    results.sort(key=lambda r: (-r['score'], order[tuple(r['config'].items())]))
+    elapsed = time.perf_counter() - t_start
+
+    current = next(r for r in results if r['config'] == configs[0])
+    print(f"\n{'score':>8} {'cpu ms':>6} {'life':>6} {'conf%':>6} {'jitter':>6}  config")
+    for label, r in [(str(i + 1), r) for i, r in enumerate(results[:10])] + [('now', current)]:
+        params = ' '.join(f"{k}={v}" for k, v in r['config'].items())
+        print(f"{r['score']:8.2f} {r['cpu_ms_per_frame']:6.2f} {r['mean_track_frames']:6.1f} "
+              f"{r['confirm_ratio'] * 100:6.1f} {r['count_jitter']:6.3f}  {params}  ({label})")
+
+    best = results[0]
+    comment = (f"tune.py: {os.path.basename(os.path.normpath(args.clip))}, {best['frames']} frames, "
+               f"{len(configs)} configs, score {best['score']:.2f} (current {current['score']:.2f})")
+    with open(args.out, 'w') as f:
+        f.write(env_snippet(best['config'], comment))
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'clip': args.clip, 'cost_weight': args.cost_weight, 'results': results}, f, indent=2)
+    print(f"\n{len(configs)} configs in {elapsed:.1f}s — best settings → {args.out}")
+
+
+if __name__ == '__main__':
+    main()
@@ -3,9 +3,11 @@ import os
 import sys
 import time
 import logging
+from typing import Optional
 from urllib.parse import urlparse
 from flask import Flask, Response, render_template, request, jsonify
 from state import AppState
+from camera_detect import CameraDiscovery
 
 logger = logging.getLogger(__name__)
 
@@ -14,11 +16,13 @@ _here = sys._MEIPASS if getattr(sys, 'frozen', False) else os.path.dirname(os.pa
 app = Flask(__name__, template_folder=os.path.join(_here, 'templates'))
 
 _state: AppState
+_discovery: Optional[CameraDiscovery] = None
 
 
-def init(state: AppState) -> None:
-    global _state
+def init(state: AppState, discovery: Optional[CameraDiscovery] = None) -> None:
+    global _state, _discovery
     _state = state
+    _discovery = discovery
 
 
 @app.route('/')
@@ -52,6 +56,14 @@ def stats_sse():
     )
 
 
+@app.route('/cameras')
+def cameras():
+    """Camera list: cached until background discovery finishes ('scanning' → false)."""
+    if _discovery is None:
+        return jsonify({'cameras': [], 'source': 'none', 'scanning': False, 'updated': None})
+    return jsonify(_discovery.snapshot())
+
+
 def _is_local_origin(origin: str) -> bool:
     """Return True only for exact http://localhost or http://127.0.0.1 (any port)."""
     try: